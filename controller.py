@@ -8,8 +8,7 @@ FL Studio를 Python에서 MIDI로 제어하기 위한 MCP 서버.
 - MIDI 포트 목록 확인
 """
 
-from typing import Any
-import time
+import asyncio
 import mido
 from mido import Message
 from mcp.server.fastmcp import FastMCP
@@ -35,7 +34,18 @@ NOTE_NAME_CHANNEL = 68  # G#3 → 채널 이름 지정
 NOTE_ADD_NOTE = 69      # A3 → 노트 추가
 NOTE_ADD_TO_PLAYLIST = 70  # A#3 → 플레이리스트 추가
 NOTE_SET_PATTERN_LEN = 71  # B3 → 패턴 길이 설정
-NOTE_CHANGE_TEMPO = 72     # C4 → 템포 변경 시작/종료
+NOTE_CHANGE_TEMPO = 72     # C4 → 템포 변경 시작
+NOTE_CHANGE_TEMPO_END = 73  # C#4 → 템포 변경 종료
+
+
+# 📨 고정 메시지 미리 생성 (호출마다 생성자 검증 생략)
+# 모든 호출이 공유하므로 수정 금지 (send()가 전송 시 복사본을 만듦)
+MSG_PLAY_ON = Message('note_on', note=NOTE_PLAY, velocity=127)
+MSG_PLAY_OFF = Message('note_off', note=NOTE_PLAY, velocity=127)
+MSG_STOP_ON = Message('note_on', note=NOTE_STOP, velocity=127)
+MSG_STOP_OFF = Message('note_off', note=NOTE_STOP, velocity=127)
+MSG_TEMPO_START = Message('note_on', note=NOTE_CHANGE_TEMPO, velocity=127)
+MSG_TEMPO_END = Message('note_on', note=NOTE_CHANGE_TEMPO_END, velocity=127)
 
 
 # 🎚 Custom MIDI CC (컨트롤 체인지) 매핑
@@ -66,15 +76,15 @@ def list_midi_ports():
 @mcp.tool()
 def play():
     """재생 시작"""
-    output_port.send(Message('note_on', note=NOTE_PLAY, velocity=127))
-    output_port.send(Message('note_off', note=NOTE_PLAY, velocity=127))
+    output_port.send(MSG_PLAY_ON)
+    output_port.send(MSG_PLAY_OFF)
 
 
 @mcp.tool()
 def stop():
     """재생 정지"""
-    output_port.send(Message('note_on', note=NOTE_STOP, velocity=127))
-    output_port.send(Message('note_off', note=NOTE_STOP, velocity=127))
+    output_port.send(MSG_STOP_ON)
+    output_port.send(MSG_STOP_OFF)
 
 
 # ----------------------------------------------------
@@ -100,14 +110,14 @@ def change_tempo(bpm: int):
     FL Studio 템포 변경
     - NOTE_CHANGE_TEMPO(72) → 시작 신호
     - bpm 값을 바이트로 분해하여 note_on 메시지 전송
-    - 73번 노트 → 종료 신호
+    - NOTE_CHANGE_TEMPO_END(73) → 종료 신호
     """
     bpm_bytes = int_to_midi_bytes(bpm)
 
-    output_port.send(Message('note_on', note=NOTE_CHANGE_TEMPO, velocity=127))
+    output_port.send(MSG_TEMPO_START)
     for b in bpm_bytes:
         output_port.send(Message('note_on', note=b, velocity=127))
-    output_port.send(Message('note_on', note=73, velocity=127))
+    output_port.send(MSG_TEMPO_END)
 
 
 @mcp.tool()
@@ -139,16 +149,20 @@ def send_melody(notes_data: str):
 
 
 @mcp.tool()
-def send_midi_note(note: int, velocity: int = 100, duration: float = 0.1):
+async def send_midi_note(note: int, velocity: int = 100, duration: float = 0.1):
     """
     단일 MIDI 노트 전송
     - note: MIDI 노트 번호
     - velocity: 건반 세기 (0~127)
     - duration: 노트 지속 시간 (초)
+    - 대기 중에도 이벤트 루프를 막지 않도록 asyncio.sleep 사용
+    - 대기 중 취소되더라도 note_off는 반드시 전송 (걸린 노트 방지)
     """
     output_port.send(Message('note_on', note=note, velocity=velocity))
-    time.sleep(duration)
-    output_port.send(Message('note_off', note=note, velocity=velocity))
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        output_port.send(Message('note_off', note=note, velocity=velocity))
 
 
 # ----------------------------------------------------